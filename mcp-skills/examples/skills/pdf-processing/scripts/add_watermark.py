@@ -6,69 +6,527 @@ Usage:
     python add_watermark.py input.pdf output.pdf "CONFIDENTIAL"
     python add_watermark.py input.pdf output.pdf "DRAFT" --opacity 0.3
     python add_watermark.py input.pdf output.pdf "COPY" --rotation 45
+    python add_watermark.py input.pdf output.pdf "COPY" --tile 4x3 --font-size 24
+    python add_watermark.py input.pdf output.pdf "DRAFT" --watermark-cache-dir ~/.cache/watermarks
+    python add_watermark.py "docs/*.pdf" output_dir/ "DRAFT" --batch
 """
 
 import sys
 import argparse
+import functools
+import hashlib
 import io
+import math
+import os
+import pathlib
+import re
+import tempfile
+import pymupdf
 from pypdf import PdfReader, PdfWriter
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
+from pypdf.generic import (ArrayObject, DecodedStreamObject, DictionaryObject,
+                           IndirectObject, NameObject)
+from pdf_batch import (PdfBatchProcessor, add_batch_arguments, batch_outputs, expand_inputs,
+                       process_pool, worker_count)
+from pdf_io import mmap_pdf, read_pdf_bytes
 
+# Pages written per partial output; bounds memory used by each worker
+BATCH_SIZE = 50
 
-def create_watermark(text, opacity=0.5, rotation=45, font_size=60):
+# Resolution of cached raster watermark stamps
+STAMP_DPI = 150
+
+# Watermark page size (US Letter) and the point the text is centred on
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+WATERMARK_CENTER = (300, 400)
+
+
+def _pdf_number(value):
+    """Format a number for a content stream, without exponent or trailing zeros."""
+    text = f"{value:.6f}".rstrip('0').rstrip('.')
+    return b"0" if text in ("", "-0") else text.encode()
+
+
+def _pdf_string(text):
+    """Encode text as a WinAnsi PDF literal string."""
+    data = text.encode('cp1252', errors='replace')
+    for char in (b"\\", b"(", b")"):
+        data = data.replace(char, b"\\" + char)
+    return b"(" + data.replace(b"\r", b"\\r") + b")"
+
+
+def tile_watermark(rows, cols, page_w, page_h, rotation):
+    """Affine matrices (a, b, c, d, e, f) placing a rotated watermark in each cell.
+
+    Cells are laid out on a rows x cols grid over the page, row by row from
+    the bottom, with each watermark centred in its cell.
+    """
+    angle = math.radians(rotation)
+    cos, sin = math.cos(angle), math.sin(angle)
+
+    return [(cos, sin, -sin, cos, page_w * (col + 0.5) / cols, page_h * (row + 0.5) / rows)
+            for row in range(rows) for col in range(cols)]
+
+
+def _watermark_box(page_box, tile):
+    """Area a watermark covers on a page with mediabox page_box.
+
+    Tiled watermarks span the whole mediabox; an untiled one always uses
+    the Letter-sized area at the origin (None).
+    """
+    if tile == (1, 1):
+        return None
+    return tuple(float(n) for n in page_box)
+
+
+def _watermark_content(text, opacity, rotation, font_size, tile=(1, 1), box=None):
+    """Content stream drawing rotated grey text once per tile.
+
+    Tiles are laid out over box (x0, y0, x1, y1), Letter at the origin by
+    default. An untiled watermark is centred on WATERMARK_CENTER.
+    """
+    if tile == (1, 1):
+        angle = math.radians(rotation)
+        cos, sin = math.cos(angle), math.sin(angle)
+        matrices = [(cos, sin, -sin, cos, *WATERMARK_CENTER)]
+    else:
+        x0, y0, x1, y1 = box or (0, 0, PAGE_WIDTH, PAGE_HEIGHT)
+        matrices = [(a, b, c, d, x0 + e, y0 + f)
+                    for a, b, c, d, e, f in tile_watermark(*tile, x1 - x0, y1 - y0, rotation)]
+
+    # Width from Helvetica's built-in metrics, measured on the text as encoded
+    encoded = text.encode('cp1252', errors='replace').decode('cp1252')
+    width = pymupdf.get_text_length(encoded, fontname="helv", fontsize=font_size)
+
+    # Everything after the matrix is identical for each tile
+    draw = b"cm\nBT /F1 %s Tf %s 0 Td %s Tj ET\nQ\n" % (
+        _pdf_number(font_size), _pdf_number(-width / 2), _pdf_string(text)
+    )
+    fragments = [b"q %s %s" % (b" ".join(_pdf_number(n) for n in matrix), draw)
+                 for matrix in matrices]
+
+    return b"%s g\n%s" % (_pdf_number(opacity), b"".join(fragments))
+
+
+@functools.lru_cache(maxsize=32)
+def render_watermark(text, opacity=0.5, rotation=45, font_size=60, tile=(1, 1), box=None):
+    """Render a watermark PDF and return its raw bytes.
+
+    The single-page PDF is written directly, referencing the standard
+    Helvetica font so no font data is embedded. tile is (rows, cols); box
+    is the page area (x0, y0, x1, y1) to tile over, Letter by default.
+    """
+    content = _watermark_content(text, opacity, rotation, font_size, tile, box)
+    mediabox = b" ".join(_pdf_number(n) for n in (box or (0, 0, PAGE_WIDTH, PAGE_HEIGHT)))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [%s] "
+        b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>" % mediabox,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content),
+    ]
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref_offset = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref_offset
+    )
+
+    return bytes(pdf)
+
+
+def create_watermark(text, opacity=0.5, rotation=45, font_size=60, tile=(1, 1), box=None):
     """Create a watermark PDF."""
-    packet = io.BytesIO()
-    c = canvas.Canvas(packet, pagesize=letter)
+    return PdfReader(io.BytesIO(render_watermark(text, opacity, rotation, font_size, tile, box)))
+
+
+def _write_atomic(path, data):
+    """Write bytes to path via a temp file and rename."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _rasterize_watermark(pdf_bytes):
+    """Rasterize a watermark PDF to a transparent, palette-quantized PNG."""
+    from PIL import Image
+
+    with pymupdf.open("pdf", pdf_bytes) as doc:
+        pix = doc[0].get_pixmap(dpi=STAMP_DPI, alpha=True)
+        image = Image.frombytes("RGBA", (pix.width, pix.height), pix.samples)
+
+    # An 8-bit palette keeps the stamp small; it only holds a few grey levels
+    image = image.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+
+    output = io.BytesIO()
+    image.save(output, format='PNG', optimize=True)
+    return output.getvalue()
+
+
+def load_watermark_stamp(cache_dir, text, opacity=0.5, rotation=45, font_size=60,
+                         tile=(1, 1), box=None):
+    """Return the watermark as (pdf_bytes, png_bytes), rendering it on a cache miss."""
+    options = (text, opacity, rotation, font_size, tile) + ((box,) if box else ())
+    key = hashlib.sha1(repr(options).encode()).hexdigest()
+    cache_dir = pathlib.Path(cache_dir).expanduser()
+    pdf_path = cache_dir / f"{key}.pdf"
+    png_path = cache_dir / f"{key}.png"
+
+    if pdf_path.exists() and png_path.exists():
+        print("Using cached watermark stamp...", file=sys.stderr)
+        return pdf_path.read_bytes(), png_path.read_bytes()
+
+    pdf_bytes = render_watermark(text, opacity, rotation, font_size, tile, box)
+    png_bytes = _rasterize_watermark(pdf_bytes)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    _write_atomic(pdf_path, pdf_bytes)
+    _write_atomic(png_path, png_bytes)
+
+    return pdf_bytes, png_bytes
+
+
+def stamp_watermark_image(input_pdf, output_pdf, load_stamp, tile=(1, 1)):
+    """Overlay a raster watermark on every page, embedding each image once.
+
+    load_stamp(box) returns the PNG for a watermark covering box (see
+    _watermark_box()); tiled watermarks need one per distinct page size.
+    """
+    with pymupdf.open("pdf", read_pdf_bytes(input_pdf)) as doc:
+        xrefs = {}
+        for page in doc:
+            # pymupdf's mediabox is in PDF user space, like the vector watermark
+            box = _watermark_box(page.mediabox, tile)
+
+            # Cover the area the vector watermark is drawn in, in unrotated
+            # PDF user space, mapped to PyMuPDF coordinates
+            area = pymupdf.Rect(box) if box else pymupdf.Rect(0, 0, PAGE_WIDTH, PAGE_HEIGHT)
+            rect = area * page.transformation_matrix
+            if box in xrefs:
+                page.insert_image(rect, xref=xrefs[box], overlay=True)
+            else:
+                xrefs[box] = page.insert_image(rect, stream=load_stamp(box), overlay=True)
+
+        print(f"Writing watermarked PDF to {output_pdf}...", file=sys.stderr)
+        doc.save(output_pdf, garbage=3, deflate=True)
+
+        return doc.page_count
+
+
+def _stream(data):
+    """Build a content stream object holding raw bytes."""
+    stream = DecodedStreamObject()
+    stream.set_data(data)
+    return stream
+
+
+def _add_indirect(writer, obj):
+    """Add obj to the writer as an indirect object and return its reference."""
+    # pypdf has no public call for this (streams must be indirect objects),
+    # so it goes through PdfWriter._add_object
+    return writer._add_object(obj)
+
+
+class _WatermarkStamp:
+    """Watermark registered once as a form XObject and shared by every page.
 
-    # Set watermark properties
-    c.setFont("Helvetica", font_size)
-    c.setFillGray(opacity)
+    merge_page() would re-parse the watermark (and the page) for each page and
+    copy its resources again; here each page only gets references added.
+    Tiled watermarks get one form per distinct page size. options are the
+    create_watermark() arguments (text, opacity, rotation, font_size, tile).
+    """
 
-    # Position and rotate watermark
-    c.saveState()
-    c.translate(300, 400)
-    c.rotate(rotation)
-    c.drawCentredString(0, 0, text)
-    c.restoreState()
+    def __init__(self, writer, options):
+        self.writer = writer
+        self.options = options
+        self.xobjects = {}
 
-    c.save()
-    packet.seek(0)
+        # Isolate the page's graphics state so the stamp is drawn untransformed
+        self.save_state = _add_indirect(writer, _stream(b"q\n"))
+        self.draw_calls = {}
 
-    return PdfReader(packet)
+    def _xobject(self, page):
+        """Form XObject holding the watermark for the page's size."""
+        box = _watermark_box(page.mediabox, self.options[4])
+        if box not in self.xobjects:
+            watermark_page = create_watermark(*self.options, box=box).pages[0]
 
+            form = _stream(watermark_page.get_contents().get_data())
+            form.update({
+                NameObject("/Type"): NameObject("/XObject"),
+                NameObject("/Subtype"): NameObject("/Form"),
+                NameObject("/BBox"): watermark_page.mediabox,
+                NameObject("/Resources"): watermark_page[NameObject("/Resources")],
+            })
+            self.xobjects[box] = _add_indirect(self.writer, form.clone(self.writer))
 
-def add_watermark(input_pdf, output_pdf, watermark_text, opacity=0.5, rotation=45):
-    """Add watermark to all pages of PDF."""
-    reader = PdfReader(input_pdf)
+        return self.xobjects[box]
+
+    def _draw_call(self, name):
+        """Shared stream that restores state and draws the XObject as `name`."""
+        if name not in self.draw_calls:
+            self.draw_calls[name] = _add_indirect(
+                self.writer, _stream(b"\nQ\nq 1 0 0 1 0 0 cm %s Do Q\n" % name.encode())
+            )
+        return self.draw_calls[name]
+
+    def apply(self, page):
+        """Stamp a page that already belongs to the writer."""
+        resources = page.get(NameObject("/Resources"))
+        resources = resources.get_object() if resources is not None else DictionaryObject()
+        page[NameObject("/Resources")] = resources
+
+        xobjects = resources.get(NameObject("/XObject"))
+        xobjects = xobjects.get_object() if xobjects is not None else DictionaryObject()
+        resources[NameObject("/XObject")] = xobjects
+
+        # Avoid clobbering an unrelated XObject that happens to use our name
+        xobject = self._xobject(page)
+        name = "/Watermark"
+        while name in xobjects and xobjects[name] != xobject:
+            name += "_"
+        xobjects[NameObject(name)] = xobject
+
+        contents = page.get(NameObject("/Contents"))
+        if contents is None:
+            parts = []
+        elif isinstance(contents.get_object(), ArrayObject):
+            parts = list(contents.get_object())
+        else:
+            parts = [contents]
+
+        page[NameObject("/Contents")] = ArrayObject(
+            [self.save_state, *parts, self._draw_call(name)]
+        )
+
+
+def _watermark_refs(page):
+    """Yield (container, key) for each object _WatermarkStamp.apply() added to page."""
+    contents = page["/Contents"]
+    yield contents, 0
+    yield contents, len(contents) - 1
+
+    draw_call = contents[-1].get_object().get_data()
+    name = re.search(rb"(/\S+) Do", draw_call).group(1).decode()
+    yield page["/Resources"]["/XObject"], NameObject(name)
+
+
+class _SharedWatermark:
+    """Appends batch parts to a writer, keeping one copy of the watermark objects.
+
+    Each part carries its own copy of the watermark form and of the streams
+    around the page contents. Before a part is appended its pages are pointed
+    at the copies already in the writer; pypdf keeps references that belong
+    to the writer instead of copying them again.
+    """
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.copies = {}
+        self.keys = {}
+
+    def _ref(self, container, key):
+        """Unresolved reference stored in container under key."""
+        return container.raw_get(key) if isinstance(container, DictionaryObject) else container[key]
+
+    def _key(self, ref):
+        """Identify a watermark object by its contents."""
+        if ref not in self.keys:
+            stream = ref.get_object()
+            self.keys[ref] = (repr(stream.get("/BBox")), stream.get_data())
+        return self.keys[ref]
+
+    def append(self, part):
+        reader = PdfReader(part)
+        new_objects = False
+        for page in reader.pages:
+            for container, key in _watermark_refs(page):
+                copy = self.copies.get(self._key(self._ref(container, key)))
+                if copy is None:
+                    new_objects = True
+                else:
+                    container[key] = copy
+
+        start = len(self.writer.pages)
+        self.writer.append(reader)
+
+        # Only the first part, or one with a new page size when tiling, has
+        # objects the writer hasn't seen
+        if new_objects:
+            for i in range(start, start + len(reader.pages)):
+                for container, key in _watermark_refs(self.writer.pages[i]):
+                    ref = self._ref(container, key)
+                    self.copies.setdefault(self._key(ref), ref)
+
+
+def _merge_field(field, copy):
+    """Move the kids of copy, a second copy of field, under field."""
+    kids = field.get_object()[NameObject("/Kids")]
+    named = {kid.get_object().get("/T"): kid for kid in kids if "/T" in kid.get_object()}
+    for kid in copy.get_object().get("/Kids", []):
+        name = kid.get_object().get("/T")
+        if name in named:
+            _merge_field(named[name], kid)
+        else:
+            kid.get_object()[NameObject("/Parent")] = field
+            kids.append(kid)
+
+
+def _restore_acroform(writer, source):
+    """Give writer the source's AcroForm, pointing at the fields of its widgets.
+
+    Each batch part carries a copy of the fields whose widgets are on its
+    pages; copies of a field whose widgets span parts are merged back into one.
+    """
+    acroform = source.trailer["/Root"].get("/AcroForm")
+    if acroform is None:
+        return
+
+    fields = {}
+    for page in writer.pages:
+        for annot in page.get("/Annots", []):
+            if not isinstance(annot, IndirectObject):
+                continue
+            # Fields are the top of each widget's /Parent chain
+            field = annot
+            while "/Parent" in field.get_object():
+                field = field.get_object().raw_get("/Parent")
+            first = fields.setdefault(field.get_object().get("/T", field), field)
+            if first != field:
+                _merge_field(first, field)
+
+    restored = DictionaryObject({
+        NameObject(key): value.clone(writer)
+        for key, value in acroform.get_object().items() if key != "/Fields"
+    })
+    restored[NameObject("/Fields")] = ArrayObject(fields.values())
+    writer.root_object[NameObject("/AcroForm")] = _add_indirect(writer, restored)
+
+
+_worker_state = {}
+
+
+def _init_worker(input_pdf, watermark_options):
+    """Open the input once per worker process.
+
+    The reader is shared by every batch the worker handles, so pypdf only
+    flattens the page tree once.
+    """
+    _worker_state['reader'] = PdfReader(read_pdf_bytes(input_pdf))
+    _worker_state['watermark_options'] = watermark_options
+
+
+def _merge_range(start, end, output_path):
+    """Watermark pages [start, end) in a worker process and write them to output_path."""
+    reader = _worker_state['reader']
     writer = PdfWriter()
+    stamp = _WatermarkStamp(writer, _worker_state['watermark_options'])
+
+    # append keeps each widget's /Parent, which add_page drops
+    writer.append(reader, pages=(start, end))
+    for page in writer.pages:
+        stamp.apply(page)
+
+    with open(output_path, 'wb') as output:
+        writer.write(output)
+
+
+def add_watermark(input_pdf, output_pdf, watermark_text, opacity=0.5, rotation=45,
+                  font_size=60, cache_dir=None, tile=(1, 1)):
+    """Add watermark to all pages of PDF.
+
+    tile=(rows, cols) repeats the watermark on a grid across each page.
+    With cache_dir, the watermark is rendered once per (text, opacity,
+    rotation, font_size, tile) and page size, cached as a PNG stamp and
+    embedded as a single shared image instead of vector text.
+    """
+    if cache_dir:
+        print(f"Creating watermark: '{watermark_text}'...", file=sys.stderr)
 
-    # Create watermark
+        def load_stamp(box):
+            return load_watermark_stamp(cache_dir, watermark_text, opacity, rotation,
+                                        font_size, tile, box)[1]
+
+        total_pages = stamp_watermark_image(input_pdf, output_pdf, load_stamp, tile)
+        print(f"✓ Successfully added watermark to {total_pages} pages", file=sys.stderr)
+        return
+
+    # Parsed once for the page count and the AcroForm. Mapping the file avoids
+    # a copy in memory, and reading /Count (as MuPDF does) leaves the page
+    # tree unflattened
+    source = mmap_pdf(input_pdf)
+    reader = PdfReader(source)
+    total_pages = reader.root_object["/Pages"]["/Count"]
+
+    # Workers render the watermark themselves, once per page size
     print(f"Creating watermark: '{watermark_text}'...", file=sys.stderr)
-    watermark = create_watermark(watermark_text, opacity, rotation)
-    watermark_page = watermark.pages[0]
+    watermark_options = (watermark_text, opacity, rotation, font_size, tile)
 
-    # Add watermark to each page
-    total_pages = len(reader.pages)
-    print(f"Adding watermark to {total_pages} pages...", file=sys.stderr)
+    # Watermark fixed-size batches into partial files on disk
+    ranges = [(start, min(start + BATCH_SIZE, total_pages))
+              for start in range(0, total_pages, BATCH_SIZE)]
+    num_workers = min(worker_count(4), len(ranges))
+    print(f"Adding watermark to {total_pages} pages "
+          f"using {num_workers} worker(s)...", file=sys.stderr)
 
-    for i, page in enumerate(reader.pages):
-        print(f"  Processing page {i+1}/{total_pages}...", file=sys.stderr)
-        page.merge_page(watermark_page)
-        writer.add_page(page)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        parts = [os.path.join(tmpdir, f"part_{i}.pdf") for i in range(len(ranges))]
 
-    # Write output
-    print(f"Writing watermarked PDF to {output_pdf}...", file=sys.stderr)
-    with open(output_pdf, 'wb') as output:
-        writer.write(output)
+        with process_pool(num_workers, initializer=_init_worker,
+                          initargs=(input_pdf, watermark_options)) as executor:
+            futures = [executor.submit(_merge_range, start, end, part)
+                       for (start, end), part in zip(ranges, parts)]
+
+            for (start, end), future in zip(ranges, futures):
+                future.result()
+                print(f"  Processed pages {start+1}-{end}/{total_pages}", file=sys.stderr)
+
+        # Stitch partial PDFs back together in page order. pypdf keeps form
+        # fields that insert_pdf would drop or rename, but it builds the whole
+        # output in memory; BATCH_SIZE only bounds the workers
+        print(f"Writing watermarked PDF to {output_pdf}...", file=sys.stderr)
+        writer = PdfWriter()
+        stitched = _SharedWatermark(writer)
+        for part in parts:
+            stitched.append(part)
+        _restore_acroform(writer, reader)
+        with open(output_pdf, 'wb') as output:
+            writer.write(output)
+
+    source.close()
 
     print(f"✓ Successfully added watermark to {total_pages} pages", file=sys.stderr)
 
 
+def _parse_tile(value):
+    """Parse a ROWSxCOLS grid size such as '3x2'."""
+    try:
+        rows, cols = (int(n) for n in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ROWSxCOLS, got '{value}'")
+
+    if rows < 1 or cols < 1:
+        raise argparse.ArgumentTypeError("rows and columns must be at least 1")
+
+    return rows, cols
+
+
 def main():
     parser = argparse.ArgumentParser(description='Add watermark to PDF')
-    parser.add_argument('input', help='Input PDF file')
-    parser.add_argument('output', help='Output PDF file')
+    parser.add_argument('input', help='Input PDF file (glob pattern with --batch)')
+    parser.add_argument('output', help='Output PDF file (directory with --batch)')
     parser.add_argument('text', help='Watermark text')
     parser.add_argument('--opacity', type=float, default=0.5,
                        help='Watermark opacity (0.0-1.0, default: 0.5)')
@@ -76,6 +534,11 @@ def main():
                        help='Watermark rotation in degrees (default: 45)')
     parser.add_argument('--font-size', type=int, default=60,
                        help='Font size (default: 60)')
+    parser.add_argument('--tile', type=_parse_tile, default=(1, 1), metavar='ROWSxCOLS',
+                       help='Repeat the watermark on a grid, e.g. 4x3 (default: 1x1)')
+    parser.add_argument('--watermark-cache-dir',
+                       help='Cache the rendered watermark here and stamp it as an image')
+    add_batch_arguments(parser)
 
     args = parser.parse_args()
 
@@ -85,12 +548,26 @@ def main():
         sys.exit(1)
 
     try:
+        if args.batch:
+            pdf_files = expand_inputs(args.input)
+            _, failures = PdfBatchProcessor(args.workers).map(
+                add_watermark, pdf_files, args.text, args.opacity, args.rotation,
+                args.font_size, args.watermark_cache_dir, args.tile,
+                outputs=batch_outputs(pdf_files, args.output, '.pdf')
+            )
+            if failures:
+                sys.exit(1)
+            return
+
         add_watermark(
             args.input,
             args.output,
             args.text,
             args.opacity,
-            args.rotation
+            args.rotation,
+            args.font_size,
+            cache_dir=args.watermark_cache_dir,
+            tile=args.tile
         )
     except FileNotFoundError:
         print(f"Error: File '{args.input}' not found", file=sys.stderr)
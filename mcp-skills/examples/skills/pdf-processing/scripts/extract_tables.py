@@ -6,12 +6,23 @@ Usage:
     python extract_tables.py input.pdf output.csv
     python extract_tables.py input.pdf output.csv --all-pages
     python extract_tables.py input.pdf output.csv --page 3
+    python extract_tables.py input.pdf output.csv --all-pages --force-refresh
+    python extract_tables.py "reports/*.pdf" output_dir/ --all-pages --batch
 """
 
 import sys
 import argparse
 import csv
+import queue
+import threading
 import pdfplumber
+from pdfminer.pdfpage import PDFPage
+from pdf_batch import PdfBatchProcessor, add_batch_arguments, batch_outputs, expand_inputs
+from pdf_io import read_pdf_bytes
+from pdf_cache import PageCache
+
+# Maximum number of items buffered between pipeline stages
+PIPELINE_QUEUE_SIZE = 8
 
 
 def extract_tables_from_page(page, table_settings=None):
@@ -21,66 +32,213 @@ def extract_tables_from_page(page, table_settings=None):
     return page.extract_tables()
 
 
-def extract_tables(pdf_path, page_num=None, all_pages=False, table_settings=None):
-    """Extract tables from PDF."""
-    all_tables = []
+def extract_cached_tables(page, table_settings, cache):
+    """Extract tables from a page, reusing results cached by a previous run."""
+    tables = cache.get(page.page_number)
+    if tables is None:
+        tables = extract_tables_from_page(page, table_settings)
+        cache.put(page.page_number, tables)
+    return tables
+
+
+def iter_pages(source, page_num=None, all_pages=False, before_close=None):
+    """Yield the pages of an in-memory PDF selected by page_num/all_pages.
 
-    with pdfplumber.open(pdf_path) as pdf:
+    The document is opened once; consumers should close() each page when
+    done with it so its parsed objects are released as extraction moves on.
+    before_close, if given, is called before the document is closed so that
+    consumers can finish with its pages first.
+    """
+    if all_pages and page_num is None:
+        with pdfplumber.open(source) as pdf:
+            # The page tree is walked once here, up front, so later page
+            # access doesn't parse the document concurrently with consumers
+            total_pages = len(pdf.pages)
+
+            for page in pdf.pages:
+                print(f"Processing page {page.page_number}/{total_pages}...", file=sys.stderr)
+                yield page
+            if before_close:
+                before_close()
+        return
+
+    # Only build the requested page instead of every page in the document
+    with pdfplumber.open(source, pages=[page_num if page_num is not None else 1]) as pdf:
         if page_num is not None:
             # Extract from specific page
-            if page_num < 1 or page_num > len(pdf.pages):
-                raise ValueError(f"Page {page_num} out of range (1-{len(pdf.pages)})")
+            if not pdf.pages:
+                total_pages = sum(1 for _ in PDFPage.create_pages(pdf.doc))
+                raise ValueError(f"Page {page_num} out of range (1-{total_pages})")
 
             print(f"Extracting tables from page {page_num}...", file=sys.stderr)
-            tables = extract_tables_from_page(pdf.pages[page_num - 1], table_settings)
-            all_tables.extend(tables)
-
-        elif all_pages:
-            # Extract from all pages
-            for i, page in enumerate(pdf.pages):
-                print(f"Processing page {i+1}/{len(pdf.pages)}...", file=sys.stderr)
-                tables = extract_tables_from_page(page, table_settings)
-                if tables:
-                    print(f"  Found {len(tables)} table(s)", file=sys.stderr)
-                    all_tables.extend(tables)
 
         else:
             # Extract from first page only
             print("Extracting tables from first page...", file=sys.stderr)
-            tables = extract_tables_from_page(pdf.pages[0], table_settings)
-            all_tables.extend(tables)
 
-    return all_tables
+        yield pdf.pages[0]
+
+        if before_close:
+            before_close()
+
+
+def extract_tables(pdf_path, page_num=None, all_pages=False, table_settings=None,
+                   force_refresh=False):
+    """Yield tables from PDF page by page as they are found."""
+    source = read_pdf_bytes(pdf_path)
+    cache = PageCache(source.getvalue(), 'tables', table_settings, refresh=force_refresh)
+
+    for page in iter_pages(source, page_num, all_pages):
+        tables = extract_cached_tables(page, table_settings, cache)
+        if tables and all_pages:
+            print(f"  Found {len(tables)} table(s)", file=sys.stderr)
+        page.close()
+        yield from tables
+
+
+def write_tables(tables, output_path, all_tables=False):
+    """Write tables to CSV as they arrive, returning (tables_found, rows_written).
+
+    Only the first table is written unless all_tables is set, in which case
+    tables are separated by a blank row. The file is created once the first
+    table arrives, and the rest of the input is still consumed so it can be
+    counted.
+    """
+    found = rows = 0
+    output = writer = None
+
+    try:
+        for table in tables:
+            found += 1
+            if found > 1 and not all_tables:
+                continue
+
+            if output is None:
+                output = open(output_path, 'w', newline='', encoding='utf-8')
+                writer = csv.writer(output)
+            else:
+                writer.writerow([])
+
+            writer.writerows(table)
+            rows += len(table)
+    finally:
+        if output:
+            output.close()
 
+    return found, rows
 
-def save_tables_to_csv(tables, output_path):
-    """Save tables to CSV file."""
-    if not tables:
+
+def _report_saved(output_path, found, rows, all_tables):
+    """Print a summary of what write_tables() saved."""
+    if not found:
         print("Warning: No tables found", file=sys.stderr)
         return
 
-    # If multiple tables, save the first one
-    # (You could enhance this to save all tables to separate files)
-    table = tables[0]
+    if all_tables:
+        print(f"✓ Saved {rows} rows from {found} table(s) to {output_path}", file=sys.stderr)
+        return
+
+    print(f"✓ Saved {rows} rows to {output_path}", file=sys.stderr)
+
+    if found > 1:
+        print(f"Note: Found {found} tables, saved first one only", file=sys.stderr)
+
+
+def extract_tables_to_csv(pdf_path, output_path, page_num=None, all_pages=False,
+                          table_settings=None, force_refresh=False):
+    """Extract tables to CSV as a three-stage pipeline.
+
+    Page loading, table detection and CSV writing each run in their own
+    thread, connected by bounded queues and shut down with a None sentinel.
+    With all_pages every table is written, otherwise only the first.
+    """
+    pages = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    results = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    errors = []
+    summary = {'found': 0, 'rows': 0}
+
+    source = read_pdf_bytes(pdf_path)
+    cache = PageCache(source.getvalue(), 'tables', table_settings, refresh=force_refresh)
+
+    def load_pages():
+        try:
+            # Wait for detection to drain a window before its document is closed
+            for page in iter_pages(source, page_num, all_pages, before_close=pages.join):
+                pages.put(page)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            pages.put(None)
 
-    with open(output_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerows(table)
+    def detect_tables():
+        try:
+            while True:
+                page = pages.get()
+                try:
+                    if page is None:
+                        break
+                    # Keep draining after a failure so the loader never blocks
+                    if not errors:
+                        tables = extract_cached_tables(page, table_settings, cache)
+                        page.close()
+                        results.put((page.page_number, tables))
+                except Exception as e:
+                    errors.append(e)
+                finally:
+                    pages.task_done()
+        finally:
+            results.put(None)
 
-    print(f"✓ Saved {len(table)} rows to {output_path}", file=sys.stderr)
+    def queued_tables():
+        # Drain every result, even after a failure, so detection never blocks
+        while (item := results.get()) is not None:
+            if errors:
+                continue
 
-    if len(tables) > 1:
-        print(f"Note: Found {len(tables)} tables, saved first one only", file=sys.stderr)
+            _, tables = item
+            if tables and all_pages:
+                print(f"  Found {len(tables)} table(s)", file=sys.stderr)
+            yield from tables
+
+    def write_rows():
+        tables = queued_tables()
+        try:
+            summary['found'], summary['rows'] = write_tables(tables, output_path, all_pages)
+        except Exception as e:
+            errors.append(e)
+            for _ in tables:
+                pass
+
+    threads = [threading.Thread(target=stage, daemon=True)
+               for stage in (load_pages, detect_tables, write_rows)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+    _report_saved(output_path, summary['found'], summary['rows'], all_pages)
+
+
+def save_tables_to_csv(tables, output_path, all_tables=False):
+    """Save tables (a list or the extract_tables() generator) to CSV file."""
+    found, rows = write_tables(tables, output_path, all_tables)
+    _report_saved(output_path, found, rows, all_tables)
 
 
 def main():
     parser = argparse.ArgumentParser(description='Extract tables from PDF to CSV')
-    parser.add_argument('input', help='Input PDF file')
-    parser.add_argument('output', help='Output CSV file')
+    parser.add_argument('input', help='Input PDF file (glob pattern with --batch)')
+    parser.add_argument('output', help='Output CSV file (directory with --batch)')
     parser.add_argument('--page', type=int, help='Extract from specific page number')
     parser.add_argument('--all-pages', action='store_true', help='Extract from all pages')
     parser.add_argument('--strategy', choices=['lines', 'text'], default='lines',
                        help='Table detection strategy')
+    parser.add_argument('--force-refresh', action='store_true',
+                       help='Ignore cached tables and extract again')
+    add_batch_arguments(parser)
 
     args = parser.parse_args()
 
@@ -91,15 +249,26 @@ def main():
             "horizontal_strategy": args.strategy,
         }
 
-        tables = extract_tables(
+        if args.batch:
+            pdf_files = expand_inputs(args.input)
+            _, failures = PdfBatchProcessor(args.workers).map(
+                extract_tables_to_csv, pdf_files,
+                args.page, args.all_pages, table_settings, args.force_refresh,
+                outputs=batch_outputs(pdf_files, args.output, '.csv')
+            )
+            if failures:
+                sys.exit(1)
+            return
+
+        extract_tables_to_csv(
             args.input,
+            args.output,
             page_num=args.page,
             all_pages=args.all_pages,
-            table_settings=table_settings
+            table_settings=table_settings,
+            force_refresh=args.force_refresh
         )
 
-        save_tables_to_csv(tables, args.output)
-
     except FileNotFoundError:
         print(f"Error: File '{args.input}' not found", file=sys.stderr)
         sys.exit(1)
@@ -6,75 +6,237 @@ Usage:
     python extract_text.py input.pdf output.txt
     python extract_text.py input.pdf output.txt --layout
     python extract_text.py input.pdf output.txt --ocr
+    python extract_text.py input.pdf output.txt --force-refresh
+    python extract_text.py "docs/*.pdf" output_dir/ --batch --workers 4
 """
 
 import sys
 import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
 import pdfplumber
+from pdfminer.pdfinterp import LITERAL_IMAGE, PDFPageInterpreter
+from pdfminer.pdftypes import stream_value
+from pdfminer.psparser import literal_name
+from pdfplumber.page import PDFPageAggregatorWithMarkedContent
+from pdfplumber.utils.exceptions import PdfminerException
+from pdf_batch import (PdfBatchProcessor, add_batch_arguments, batch_outputs, expand_inputs,
+                       process_pool, worker_count)
+from pdf_io import mmap_pdf
+from pdf_cache import PageCache
+
+
+def _skip_operator(self):
+    """Ignore an operator and discard its operands."""
+    self.argstack = []
+
+
+class TextOnlyInterpreter(PDFPageInterpreter):
+    """pdfminer interpreter that only does the work needed to place text.
+
+    Path construction/painting, colour and image operators are skipped, so
+    no curves, rects or images are built. Graphics state (q/Q/cm) and form
+    XObjects are still honoured because they position text.
+    """
+
+    # Path construction and painting
+    do_m = do_l = do_c = do_v = do_y = do_h = do_re = _skip_operator
+    do_S = do_s = do_f = do_F = do_f_a = do_B = do_B_a = do_b = do_b_a = do_n = _skip_operator
+    do_sh = _skip_operator
+
+    # Colour
+    do_CS = do_cs = do_G = do_g = do_RG = do_rg = do_K = do_k = _skip_operator
+    do_SC = do_SCN = do_sc = do_scn = _skip_operator
+
+    # Inline images
+    do_EI = _skip_operator
+
+    def do_Do(self, xobjid_arg):
+        """Invoke form XObjects (which may hold text) but skip images."""
+        xobj = self.xobjmap.get(literal_name(xobjid_arg))
+        if xobj is not None and stream_value(xobj).get("Subtype") is LITERAL_IMAGE:
+            return
+        super().do_Do(xobjid_arg)
+
+
+def _text_only_layout(page):
+    """Lay out a page with TextOnlyInterpreter and cache it on the page.
+
+    pdfplumber reuses page._layout when present, so text extraction then
+    runs on this reduced layout. Graphics (page.rects, page.images, ...)
+    are not available from a page prepared this way.
+    """
+    # Mirrors pdfplumber.Page.layout as of pdfplumber 0.11.10, which caches
+    # the result in the private page._layout; recheck when upgrading
+    device = PDFPageAggregatorWithMarkedContent(
+        page.pdf.rsrcmgr,
+        pageno=page.page_number,
+        laparams=page.pdf.laparams,
+    )
+    try:
+        TextOnlyInterpreter(page.pdf.rsrcmgr, device).process_page(page.page_obj)
+    except Exception as e:
+        raise PdfminerException(e)
+    page._layout = device.get_result()
 
 
-def extract_text(pdf_path, layout=False, ocr=False):
-    """Extract text from PDF file."""
-    text = []
+def _extract_one(page, layout=False):
+    """Extract text from a single page."""
+    _text_only_layout(page)
+
+    if layout:
+        return page.extract_text(
+            x_tolerance=3,
+            y_tolerance=3,
+            layout=True
+        )
+    return page.extract_text()
+
+
+def _extract_pages(pdf_path, page_numbers, layout=False):
+    """Extract text from the given 1-based pages using a worker-owned document.
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for i, page in enumerate(pdf.pages):
-            print(f"Processing page {i+1}/{len(pdf.pages)}...", file=sys.stderr)
+    pdfminer reads objects through a shared file position, so each worker
+    maps the file itself instead of sharing pages across threads. The maps
+    share the same physical pages.
+    """
+    with mmap_pdf(pdf_path) as source, pdfplumber.open(source, pages=page_numbers) as pdf:
+        return [_extract_one(page, layout) for page in pdf.pages]
 
-            if layout:
-                page_text = page.extract_text(
-                    x_tolerance=3,
-                    y_tolerance=3,
-                    layout=True
-                )
-            else:
-                page_text = page.extract_text()
 
-            if page_text:
-                text.append(f"--- Page {i+1} ---\n{page_text}")
+def extract_text(pdf_path, layout=False, ocr=False, force_refresh=False):
+    """Extract text from PDF file."""
+    with mmap_pdf(pdf_path) as source:
+        with pdfplumber.open(source) as pdf:
+            total_pages = len(pdf.pages)
+
+        # Only parse pages that aren't already cached from a previous run
+        cache = PageCache(source, 'layout-text' if layout else 'text',
+                          refresh=force_refresh)
+    page_texts = {n: cache.get(n) for n in range(1, total_pages + 1)}
+    missing = [n for n, page_text in page_texts.items() if page_text is None]
+
+    if not missing:
+        print(f"All {total_pages} pages cached", file=sys.stderr)
+    else:
+        num_workers = worker_count(8)
+        chunk_size = -(-len(missing) // num_workers)
+        chunks = [missing[i:i + chunk_size] for i in range(0, len(missing), chunk_size)]
+        print(f"Processing {total_pages} pages ({total_pages - len(missing)} cached) "
+              f"using {len(chunks)} worker(s)...", file=sys.stderr)
+
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            futures = [executor.submit(_extract_pages, pdf_path, chunk, layout)
+                       for chunk in chunks]
+
+            for chunk, future in zip(chunks, futures):
+                for page_number, page_text in zip(chunk, future.result()):
+                    cache.put(page_number, page_text)
+                    page_texts[page_number] = page_text
+                print(f"Processed pages {chunk[0]}-{chunk[-1]}/{total_pages}", file=sys.stderr)
+
+    # Assemble in page order regardless of completion order
+    text = [f"--- Page {n} ---\n{page_texts[n]}"
+            for n in range(1, total_pages + 1) if page_texts[n]]
 
     return "\n\n".join(text)
 
 
+_ocr_document = None
+
+
+def _init_ocr_worker(pdf_path):
+    """Open the PDF once per OCR worker process."""
+    global _ocr_document
+    import pymupdf
+
+    _ocr_document = pymupdf.open(pdf_path)
+
+
+def _ocr_page(index):
+    """Render a single page in-process and run tesseract on it."""
+    import pytesseract
+    from PIL import Image
+
+    try:
+        pix = _ocr_document[index].get_pixmap(dpi=300)
+        image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+        # Release the pixmap before OCR so only one rendered copy is alive
+        del pix
+
+        return pytesseract.image_to_string(image)
+    except Exception as e:
+        # Some pytesseract errors can't be unpickled, which would break the
+        # pool instead of reporting the error
+        raise RuntimeError(f"OCR failed on page {index + 1}: {e}") from None
+
+
 def extract_text_ocr(pdf_path):
     """Extract text using OCR for scanned PDFs."""
     try:
-        from pdf2image import convert_from_path
+        import pymupdf
         import pytesseract
     except ImportError:
-        print("Error: OCR requires pdf2image and pytesseract", file=sys.stderr)
-        print("Install with: pip install pdf2image pytesseract", file=sys.stderr)
+        print("Error: OCR requires pymupdf and pytesseract", file=sys.stderr)
+        print("Install with: pip install pymupdf pytesseract", file=sys.stderr)
         sys.exit(1)
 
-    print("Converting PDF to images...", file=sys.stderr)
-    images = convert_from_path(pdf_path)
+    # Fail fast, with pytesseract's message, before starting any workers
+    try:
+        pytesseract.get_tesseract_version()
+    except pytesseract.TesseractNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    with pymupdf.open(pdf_path) as doc:
+        total_pages = doc.page_count
 
     text = []
-    for i, image in enumerate(images):
-        print(f"OCR processing page {i+1}/{len(images)}...", file=sys.stderr)
-        page_text = pytesseract.image_to_string(image)
-        text.append(f"--- Page {i+1} ---\n{page_text}")
+    with process_pool(min(worker_count(os.cpu_count() or 1), total_pages),
+                      initializer=_init_ocr_worker, initargs=(pdf_path,)) as executor:
+        for i, page_text in enumerate(executor.map(_ocr_page, range(total_pages))):
+            print(f"OCR processed page {i+1}/{total_pages}", file=sys.stderr)
+            text.append(f"--- Page {i+1} ---\n{page_text}")
 
     return "\n\n".join(text)
 
 
+def extract_text_to_file(pdf_path, output_path, layout=False, ocr=False, force_refresh=False):
+    """Extract text from a PDF and write it to a UTF-8 text file."""
+    if ocr:
+        text = extract_text_ocr(pdf_path)
+    else:
+        text = extract_text(pdf_path, layout=layout, force_refresh=force_refresh)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Extract text from PDF files')
-    parser.add_argument('input', help='Input PDF file')
-    parser.add_argument('output', help='Output text file')
+    parser.add_argument('input', help='Input PDF file (glob pattern with --batch)')
+    parser.add_argument('output', help='Output text file (directory with --batch)')
     parser.add_argument('--layout', action='store_true', help='Preserve layout')
     parser.add_argument('--ocr', action='store_true', help='Use OCR for scanned PDFs')
+    parser.add_argument('--force-refresh', action='store_true',
+                       help='Ignore cached page text and extract again')
+    add_batch_arguments(parser)
 
     args = parser.parse_args()
 
     try:
-        if args.ocr:
-            text = extract_text_ocr(args.input)
-        else:
-            text = extract_text(args.input, layout=args.layout)
-
-        with open(args.output, 'w', encoding='utf-8') as f:
-            f.write(text)
+        if args.batch:
+            pdf_files = expand_inputs(args.input)
+            _, failures = PdfBatchProcessor(args.workers).map(
+                extract_text_to_file, pdf_files, args.layout, args.ocr, args.force_refresh,
+                outputs=batch_outputs(pdf_files, args.output, '.txt')
+            )
+            if failures:
+                sys.exit(1)
+            return
+
+        extract_text_to_file(args.input, args.output, layout=args.layout,
+                             ocr=args.ocr, force_refresh=args.force_refresh)
 
         print(f"✓ Text extracted to {args.output}", file=sys.stderr)
 
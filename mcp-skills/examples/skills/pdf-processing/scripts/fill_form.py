@@ -6,39 +6,50 @@ Usage:
     python fill_form.py list input.pdf
     python fill_form.py fill input.pdf output.pdf data.json
     python fill_form.py fill input.pdf output.pdf --field name="John Doe" --field email="john@example.com"
+    python fill_form.py fill "forms/*.pdf" output_dir/ --json data.json --batch
 """
 
 import sys
 import argparse
 import json
 from pypdf import PdfReader, PdfWriter
+from pdf_batch import PdfBatchProcessor, add_batch_arguments, batch_outputs, expand_inputs
+from pdf_io import read_pdf_bytes
 
 
-def list_form_fields(pdf_path):
-    """List all form fields in PDF."""
-    reader = PdfReader(pdf_path)
+def read_form_fields(pdf_path):
+    """Return a dict of form field names and values."""
+    return PdfReader(read_pdf_bytes(pdf_path)).get_form_text_fields()
 
-    try:
-        fields = reader.get_form_text_fields()
 
-        if not fields:
-            print("No form fields found in PDF", file=sys.stderr)
-            return
+def print_form_fields(fields):
+    """Print form fields returned by read_form_fields()."""
+    if not fields:
+        print("No form fields found in PDF", file=sys.stderr)
+        return
 
-        print(f"Found {len(fields)} form fields:\n")
-        for field_name, field_value in fields.items():
-            value = field_value if field_value else "(empty)"
-            print(f"  {field_name}: {value}")
+    print(f"Found {len(fields)} form fields:\n")
+    for field_name, field_value in fields.items():
+        value = field_value if field_value else "(empty)"
+        print(f"  {field_name}: {value}")
 
+
+def list_form_fields(pdf_path):
+    """List all form fields in PDF."""
+    try:
+        fields = read_form_fields(pdf_path)
+    except FileNotFoundError:
+        raise
     except Exception as e:
         print(f"Error reading form fields: {e}", file=sys.stderr)
         sys.exit(1)
 
+    print_form_fields(fields)
+
 
 def fill_form_fields(input_pdf, output_pdf, field_data):
     """Fill PDF form fields with provided data."""
-    reader = PdfReader(input_pdf)
-    writer = PdfWriter()
+    reader = PdfReader(read_pdf_bytes(input_pdf))
 
     # Get existing fields
     existing_fields = reader.get_form_text_fields()
@@ -52,8 +63,9 @@ def fill_form_fields(input_pdf, output_pdf, field_data):
     if unknown_fields:
         print(f"  Warning: Unknown fields: {', '.join(unknown_fields)}", file=sys.stderr)
 
-    # Copy all pages
-    writer.append(reader)
+    # Clone the document as-is; content streams are copied without being
+    # parsed, and only the form field values are changed below
+    writer = PdfWriter(clone_from=reader)
 
     # Update form fields on first page (you can extend this for multi-page forms)
     writer.update_page_form_field_values(
@@ -89,15 +101,17 @@ def main():
 
     # List command
     list_parser = subparsers.add_parser('list', help='List form fields')
-    list_parser.add_argument('input', help='Input PDF file')
+    list_parser.add_argument('input', help='Input PDF file (glob pattern with --batch)')
+    add_batch_arguments(list_parser)
 
     # Fill command
     fill_parser = subparsers.add_parser('fill', help='Fill form fields')
-    fill_parser.add_argument('input', help='Input PDF file')
-    fill_parser.add_argument('output', help='Output PDF file')
+    fill_parser.add_argument('input', help='Input PDF file (glob pattern with --batch)')
+    fill_parser.add_argument('output', help='Output PDF file (directory with --batch)')
     fill_parser.add_argument('--json', help='JSON file with field data')
     fill_parser.add_argument('--field', action='append',
                            help='Field data (e.g., --field name="John Doe")')
+    add_batch_arguments(fill_parser)
 
     args = parser.parse_args()
 
@@ -106,7 +120,19 @@ def main():
         sys.exit(1)
 
     try:
-        if args.command == 'list':
+        if args.command == 'list' and args.batch:
+            pdf_files = expand_inputs(args.input)
+            results, failures = PdfBatchProcessor(args.workers).map(read_form_fields, pdf_files)
+
+            # Print in input order once all files are read
+            for pdf_file in pdf_files:
+                if pdf_file in results:
+                    print(f"\n{pdf_file}")
+                    print_form_fields(results[pdf_file])
+            if failures:
+                sys.exit(1)
+
+        elif args.command == 'list':
             list_form_fields(args.input)
 
         elif args.command == 'fill':
@@ -120,7 +146,16 @@ def main():
                 print("Error: Provide field data via --json or --field", file=sys.stderr)
                 sys.exit(1)
 
-            fill_form_fields(args.input, args.output, field_data)
+            if args.batch:
+                pdf_files = expand_inputs(args.input)
+                _, failures = PdfBatchProcessor(args.workers).map(
+                    fill_form_fields, pdf_files, field_data,
+                    outputs=batch_outputs(pdf_files, args.output, '.pdf')
+                )
+                if failures:
+                    sys.exit(1)
+            else:
+                fill_form_fields(args.input, args.output, field_data)
 
     except FileNotFoundError as e:
         print(f"Error: File not found - {e}", file=sys.stderr)
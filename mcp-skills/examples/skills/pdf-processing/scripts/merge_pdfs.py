@@ -5,36 +5,136 @@ Merge multiple PDF files into one.
 Usage:
     python merge_pdfs.py output.pdf file1.pdf file2.pdf file3.pdf
     python merge_pdfs.py merged.pdf *.pdf
+    python merge_pdfs.py output_dir/ "chapters/*/*.pdf" --batch
 """
 
 import sys
 import argparse
-from pypdf import PdfWriter
+import os
+import pymupdf
+from pdf_batch import (PdfBatchProcessor, add_batch_arguments, batch_outputs, expand_inputs,
+                       process_pool, worker_count)
 
 
-def merge_pdfs(pdf_files, output_path):
-    """Merge multiple PDF files into one."""
-    merger = PdfWriter()
+def _offset_toc(toc, offset):
+    """Shift the page numbers of get_toc() entries by offset pages."""
+    # Page -1 marks an entry without a destination
+    return [[level, title, page + offset if page > 0 else page, *rest]
+            for level, title, page, *rest in toc]
+
 
-    for i, pdf_file in enumerate(pdf_files):
-        print(f"Adding {pdf_file} ({i+1}/{len(pdf_files)})...", file=sys.stderr)
+def _merge_chunk(pdf_files):
+    """Merge a chunk of files in a worker process.
+
+    insert_pdf() doesn't copy bookmarks, so they are collected separately.
+    Returns (pdf_bytes, toc, failures): the merged PDF (None if no file could
+    be read), its outline as get_toc() entries, and (file, error) pairs for
+    files that failed.
+    """
+    merged = pymupdf.open()
+    toc = []
+    failures = []
+
+    for pdf_file in pdf_files:
         try:
-            merger.append(pdf_file)
+            # Force PDF parsing; MuPDF would otherwise convert images or text files
+            with pymupdf.open(pdf_file, filetype="pdf") as doc:
+                offset = merged.page_count
+                doc_toc = doc.get_toc(simple=False)
+                merged.insert_pdf(doc)
+                toc.extend(_offset_toc(doc_toc, offset))
         except Exception as e:
-            print(f"Warning: Failed to add {pdf_file}: {e}", file=sys.stderr)
+            failures.append((pdf_file, str(e)))
+
+    if not merged.page_count:
+        return None, [], failures
+
+    return merged.tobytes(), toc, failures
+
+
+def _merge_pair(first, second):
+    """Combine two partially merged (pdf_bytes, toc) parts, preserving order."""
+    merged = pymupdf.open("pdf", first[0])
+    offset = merged.page_count
+    with pymupdf.open("pdf", second[0]) as other:
+        merged.insert_pdf(other)
+    return merged.tobytes(), first[1] + _offset_toc(second[1], offset)
+
+
+def merge_pdfs(pdf_files, output_path):
+    """Merge multiple PDF files into one."""
+    num_workers = min(worker_count(8), len(pdf_files))
+    chunk_size = -(-len(pdf_files) // num_workers)
+    chunks = [pdf_files[i:i + chunk_size] for i in range(0, len(pdf_files), chunk_size)]
+
+    with process_pool(num_workers) as executor:
+        # Merge each chunk of input files independently
+        print(f"Merging {len(pdf_files)} files in {len(chunks)} chunk(s)...", file=sys.stderr)
+        parts = []
+        for chunk, (data, toc, failures) in zip(chunks, executor.map(_merge_chunk, chunks)):
+            failed = dict(failures)
+            for pdf_file in chunk:
+                if pdf_file in failed:
+                    print(f"Warning: Failed to add {pdf_file}: {failed[pdf_file]}", file=sys.stderr)
+                else:
+                    print(f"  Added {pdf_file}", file=sys.stderr)
+            # Skip chunks in which no file could be read
+            if data is not None:
+                parts.append((data, toc))
+
+        if not parts:
+            raise ValueError("None of the input files could be merged")
 
+        # Combine neighbouring parts pairwise until a single document remains
+        while len(parts) > 1:
+            print(f"Combining {len(parts)} partial PDFs...", file=sys.stderr)
+            merged = list(executor.map(_merge_pair, parts[0::2], parts[1::2]))
+            if len(parts) % 2:
+                merged.append(parts[-1])
+            parts = merged
+
+    # Drop unused objects and compress streams only once, on the final document
     print(f"Writing merged PDF to {output_path}...", file=sys.stderr)
-    with open(output_path, 'wb') as output:
-        merger.write(output)
+    data, toc = parts[0]
+    with pymupdf.open("pdf", data) as merged:
+        try:
+            merged.set_toc(toc)
+        except ValueError as e:
+            # MuPDF rejects outlines with inconsistent levels; keep the pages
+            print(f"Warning: Could not copy bookmarks: {e}", file=sys.stderr)
+        merged.save(output_path, garbage=4, deflate=True)
 
-    merger.close()
     print(f"✓ Successfully merged {len(pdf_files)} files", file=sys.stderr)
 
 
+def _merge_directory(directory, output_path, groups):
+    """Batch worker: merge one directory's files into output_path."""
+    if any(os.path.abspath(f) == os.path.abspath(output_path) for f in groups[directory]):
+        raise ValueError("Output file cannot be one of the input files")
+
+    merge_pdfs(groups[directory], output_path)
+
+
+def merge_directories(patterns, output_dir, workers):
+    """Merge the files matching patterns into one PDF per parent directory."""
+    groups = {}
+    for pdf_file in expand_inputs(patterns):
+        groups.setdefault(os.path.dirname(pdf_file) or '.', []).append(pdf_file)
+
+    directories = sorted(groups)
+    return PdfBatchProcessor(workers).map(
+        _merge_directory, directories, groups,
+        outputs=batch_outputs(directories, output_dir, '.pdf')
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(description='Merge multiple PDF files')
-    parser.add_argument('output', help='Output PDF file')
-    parser.add_argument('inputs', nargs='+', help='Input PDF files to merge')
+    parser.add_argument('output', help='Output PDF file (directory with --batch)')
+    parser.add_argument('inputs', nargs='+',
+                       help='Input PDF files to merge (glob patterns with --batch; '
+                            'files are merged per directory)')
+    add_batch_arguments(parser)
 
     args = parser.parse_args()
 
@@ -44,6 +144,12 @@ def main():
         sys.exit(1)
 
     try:
+        if args.batch:
+            _, failures = merge_directories(args.inputs, args.output, args.workers)
+            if failures:
+                sys.exit(1)
+            return
+
         merge_pdfs(args.inputs, args.output)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
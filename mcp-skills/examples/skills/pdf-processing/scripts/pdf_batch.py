@@ -0,0 +1,189 @@
+"""
+Shared batch mode for the PDF scripts.
+
+Every script accepts --batch: its input argument is then treated as a glob
+pattern, its output argument as a directory, and matching files are
+processed in parallel worker processes. This avoids paying interpreter
+startup and library imports once per file in a shell loop.
+
+Outputs mirror the inputs' directory layout below their common parent, so
+docs/2023/report.pdf and docs/2024/report.pdf are written to
+out/2023/report.txt and out/2024/report.txt.
+
+Usage:
+    from pdf_batch import PdfBatchProcessor, batch_outputs, expand_inputs
+
+    paths = expand_inputs(["docs/**/*.pdf"])
+    outputs = batch_outputs(paths, "out/", ".txt")
+    results, failures = PdfBatchProcessor(workers=4).map(process_one, paths, outputs=outputs)
+"""
+
+import os
+import sys
+import glob
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+
+DEFAULT_WORKERS = min(os.cpu_count() or 1, 4)
+
+# Set inside batch worker processes so per-file work doesn't start its own
+# full-size pools on top of the batch pool
+_in_batch_worker = False
+
+
+def worker_count(limit):
+    """Number of workers a script should use for work within a single file."""
+    if _in_batch_worker:
+        return 1
+    return min(os.cpu_count() or 1, limit)
+
+
+class _InlineExecutor:
+    """Stand-in for ProcessPoolExecutor that runs every call in this process."""
+
+    def __init__(self, initializer=None, initargs=()):
+        if initializer is not None:
+            initializer(*initargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def map(self, fn, *iterables):
+        return map(fn, *iterables)
+
+
+def process_pool(max_workers, initializer=None, initargs=()):
+    """Executor for work within a single file.
+
+    With a single worker (always the case inside a batch worker) the work runs
+    in this process: a one-process pool would only add a process start per
+    file, plus fresh library imports where workers are spawned.
+    """
+    if max_workers <= 1:
+        return _InlineExecutor(initializer, initargs)
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=initializer,
+                               initargs=initargs)
+
+
+def _init_batch_worker():
+    """Mark the process as a batch worker and import PDF libraries once."""
+    global _in_batch_worker
+    _in_batch_worker = True
+
+    # Already loaded when workers are forked; spawned workers import them here
+    # once instead of on first use in every task
+    for module in ('pypdf', 'pdfplumber', 'pymupdf'):
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+
+
+def add_batch_arguments(parser):
+    """Add the --batch and --workers options to an argument parser."""
+    parser.add_argument('--batch', action='store_true',
+                       help='Treat input as a glob pattern and output as a directory')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                       help=f'Parallel workers in batch mode (default: {DEFAULT_WORKERS})')
+
+
+def expand_inputs(patterns):
+    """Expand glob patterns into a sorted list of unique file paths."""
+    if isinstance(patterns, str):
+        patterns = [patterns]
+
+    paths = sorted({path for pattern in patterns
+                    for path in glob.glob(os.path.expanduser(pattern), recursive=True)
+                    if os.path.isfile(path)})
+    if not paths:
+        raise FileNotFoundError(f"No files match {', '.join(patterns)}")
+
+    return paths
+
+
+def batch_outputs(paths, output_dir, suffix):
+    """Map each input path to an output path under output_dir.
+
+    Each output keeps its input's path relative to the inputs' common parent
+    directory, with the file extension replaced by suffix (directories just
+    get suffix appended). Output subdirectories are created. Raises
+    ValueError, before anything is written, if two inputs would share an
+    output or an output would overwrite an input.
+    """
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+    inputs = {os.path.abspath(path) for path in paths}
+
+    outputs = {}
+    claimed = {}
+    for path in paths:
+        relative = os.path.relpath(os.path.abspath(path), root)
+        if os.path.isfile(path):
+            relative = os.path.splitext(relative)[0]
+        output_path = os.path.join(output_dir, relative + suffix)
+
+        key = os.path.normcase(os.path.abspath(output_path))
+        if key in claimed:
+            raise ValueError(f"'{claimed[key]}' and '{path}' would both be written to '{output_path}'")
+        if key in inputs:
+            raise ValueError(f"Output would overwrite input file '{path}'")
+        claimed[key] = path
+        outputs[path] = output_path
+
+    for output_path in outputs.values():
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+
+    return outputs
+
+
+class PdfBatchProcessor:
+    """Run a per-file function over many inputs in a process pool."""
+
+    def __init__(self, workers=DEFAULT_WORKERS):
+        self.workers = max(1, workers)
+
+    def map(self, func, paths, *args, outputs=None):
+        """Call func(path, *args) for each path in parallel.
+
+        With outputs (as returned by batch_outputs()), func is called as
+        func(path, outputs[path], *args) instead. Returns (results, failures):
+        dicts keyed by path holding each return value or the exception
+        raised. Progress is reported as files finish.
+        """
+        results = {}
+        failures = {}
+
+        print(f"Processing {len(paths)} file(s) with {self.workers} worker(s)...", file=sys.stderr)
+
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 initializer=_init_batch_worker) as executor:
+            futures = {}
+            for path in paths:
+                call_args = (outputs[path], *args) if outputs is not None else args
+                futures[executor.submit(func, path, *call_args)] = path
+
+            for done, future in enumerate(as_completed(futures), 1):
+                path = futures[future]
+                try:
+                    results[path] = future.result()
+                    print(f"[{done}/{len(paths)}] ✓ {path}", file=sys.stderr)
+                # Per-file code may sys.exit() on errors; count that as a failure
+                except (Exception, SystemExit) as e:
+                    failures[path] = e
+                    reason = f"exit status {e.code}" if isinstance(e, SystemExit) else e
+                    print(f"[{done}/{len(paths)}] ✗ {path}: {reason}", file=sys.stderr)
+
+        print(f"✓ Processed {len(results)}/{len(paths)} file(s)", file=sys.stderr)
+        if failures:
+            print(f"Warning: {len(failures)} file(s) failed", file=sys.stderr)
+
+        return results, failures
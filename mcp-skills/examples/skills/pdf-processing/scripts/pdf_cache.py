@@ -0,0 +1,100 @@
+"""
+Disk cache for per-page extraction results, keyed by a hash of the PDF.
+
+Results are stored as JSON under ~/.cache/mcp-pdf/<digest>/ (override the
+location with MCP_PDF_CACHE_DIR). Re-running an extraction on an unchanged
+PDF reads pages from the cache instead of parsing them again.
+
+Usage:
+    from pdf_cache import PageCache
+
+    cache = PageCache(pdf_bytes, 'text')
+    page_text = cache.get(1)
+    if page_text is None:
+        page_text = extract(...)
+        cache.put(1, page_text)
+"""
+
+import os
+import json
+import hashlib
+import sys
+import pathlib
+import tempfile
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+
+CACHE_ROOT = pathlib.Path(
+    os.environ.get('MCP_PDF_CACHE_DIR', '~/.cache/mcp-pdf')
+).expanduser()
+
+
+def pdf_digest(pdf_bytes):
+    """Hash PDF contents, using BLAKE3 when installed and SHA-1 otherwise."""
+    if blake3 is not None:
+        return blake3.blake3(pdf_bytes).hexdigest()
+    return hashlib.sha1(pdf_bytes).hexdigest()
+
+
+class PageCache:
+    """Per-page results for one PDF and one kind of extraction.
+
+    options distinguishes results of the same kind produced with different
+    settings (e.g. table detection strategy). With refresh=True, cached
+    entries are ignored and overwritten. Caching is best-effort: if the
+    cache directory can't be written, results are simply not stored.
+    """
+
+    def __init__(self, pdf_bytes, kind, options=None, refresh=False):
+        self.directory = CACHE_ROOT / pdf_digest(pdf_bytes)
+        self.refresh = refresh
+        self.writable = True
+
+        self.suffix = kind
+        if options:
+            key = json.dumps(options, sort_keys=True).encode()
+            self.suffix += '-' + hashlib.sha1(key).hexdigest()[:12]
+
+    def _path(self, page_number):
+        return self.directory / f"p{page_number}.{self.suffix}.json"
+
+    def get(self, page_number):
+        """Return the cached result for a page, or None on a miss."""
+        if self.refresh:
+            return None
+
+        try:
+            return json.loads(self._path(page_number).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, page_number, value):
+        """Store a page result, writing atomically via a temp file and rename."""
+        if not self.writable:
+            return
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        except OSError as e:
+            # Don't retry (and warn) for every remaining page
+            self.writable = False
+            print(f"Warning: Not caching results: {e}", file=sys.stderr)
+            return
+
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f)
+            os.replace(tmp_path, self._path(page_number))
+        except BaseException as e:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            # A failed write (e.g. a full disk) only costs this cache entry
+            if not isinstance(e, OSError):
+                raise
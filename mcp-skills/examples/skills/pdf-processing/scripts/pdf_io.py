@@ -0,0 +1,44 @@
+"""
+Shared helpers for loading PDFs and running qpdf.
+
+Usage:
+    from pdf_io import QPDF, check_qpdf, mmap_pdf, read_pdf_bytes, run_qpdf
+
+    reader = PdfReader(read_pdf_bytes('document.pdf'))
+    with mmap_pdf('large.pdf') as source, pdfplumber.open(source) as pdf:
+        ...
+    if QPDF:
+        check_qpdf(run_qpdf(['--decrypt', 'in.pdf', 'out.pdf']))
+"""
+
+import io
+import mmap
+import pathlib
+import shutil
+import subprocess
+
+# qpdf is used instead of PyMuPDF when installed
+QPDF = shutil.which("qpdf")
+
+
+def read_pdf_bytes(path):
+    """Read a PDF fully into memory so parsing doesn't seek on disk."""
+    return io.BytesIO(pathlib.Path(path).read_bytes())
+
+
+def mmap_pdf(path):
+    """Map a PDF read-only; pages are faulted in from the page cache on demand."""
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def run_qpdf(args):
+    """Run qpdf, passing arguments on stdin so passwords stay out of `ps`."""
+    return subprocess.run([QPDF, "@-"], input="\n".join(args),
+                          capture_output=True, text=True)
+
+
+def check_qpdf(result):
+    """Raise if qpdf failed; exit status 3 means success with warnings."""
+    if result.returncode not in (0, 3):
+        raise RuntimeError(f"qpdf failed: {result.stderr.strip()}")
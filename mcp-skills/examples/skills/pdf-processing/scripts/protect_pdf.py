@@ -5,72 +5,113 @@ Add or remove password protection from PDF files.
 Usage:
     python protect_pdf.py encrypt input.pdf output.pdf mypassword
     python protect_pdf.py decrypt input.pdf output.pdf mypassword
+    python protect_pdf.py encrypt "docs/*.pdf" output_dir/ mypassword --batch
 """
 
 import sys
 import argparse
-from pypdf import PdfReader, PdfWriter
+import os
+import pymupdf
+from pdf_batch import PdfBatchProcessor, add_batch_arguments, batch_outputs, expand_inputs
+from pdf_io import QPDF, check_qpdf, read_pdf_bytes, run_qpdf
 
 
 def encrypt_pdf(input_pdf, output_pdf, password):
     """Add password protection to PDF."""
-    reader = PdfReader(input_pdf)
-    writer = PdfWriter()
-
-    print(f"Encrypting {len(reader.pages)} pages...", file=sys.stderr)
-
-    for page in reader.pages:
-        writer.add_page(page)
-
-    # Encrypt with password
-    writer.encrypt(password)
-
-    with open(output_pdf, 'wb') as output:
-        writer.write(output)
+    if QPDF:
+        if not os.path.isfile(input_pdf):
+            raise FileNotFoundError(input_pdf)
+
+        print("Encrypting PDF with qpdf...", file=sys.stderr)
+        check_qpdf(run_qpdf(["--encrypt", password, password, "256", "--",
+                               input_pdf, output_pdf]))
+        print(f"✓ PDF encrypted and saved to {output_pdf}", file=sys.stderr)
+        return
+
+    with pymupdf.open("pdf", read_pdf_bytes(input_pdf)) as doc:
+        print(f"Encrypting {doc.page_count} pages...", file=sys.stderr)
+
+        # Encrypt with password
+        doc.save(
+            output_pdf,
+            encryption=pymupdf.PDF_ENCRYPT_AES_256,
+            owner_pw=password,
+            user_pw=password
+        )
 
     print(f"✓ PDF encrypted and saved to {output_pdf}", file=sys.stderr)
 
 
 def decrypt_pdf(input_pdf, output_pdf, password):
     """Remove password protection from PDF."""
-    reader = PdfReader(input_pdf)
-
-    if not reader.is_encrypted:
-        print("Warning: PDF is not encrypted", file=sys.stderr)
-        # Just copy it
-        writer = PdfWriter()
-        for page in reader.pages:
-            writer.add_page(page)
-    else:
-        print("Decrypting PDF...", file=sys.stderr)
+    if QPDF:
+        if not os.path.isfile(input_pdf):
+            raise FileNotFoundError(input_pdf)
+
+        # --is-encrypted exits with 0 when encrypted and 2 when not
+        if run_qpdf(["--is-encrypted", input_pdf]).returncode == 2:
+            # Just copy it
+            print("Warning: PDF is not encrypted", file=sys.stderr)
+        else:
+            print("Decrypting PDF with qpdf...", file=sys.stderr)
 
-        # Try to decrypt
-        if not reader.decrypt(password):
+        result = run_qpdf([f"--password={password}", "--decrypt", input_pdf, output_pdf])
+        if result.returncode == 2 and "invalid password" in result.stderr:
             print("Error: Incorrect password", file=sys.stderr)
             sys.exit(1)
+        check_qpdf(result)
 
-        writer = PdfWriter()
-        for page in reader.pages:
-            writer.add_page(page)
+        print(f"✓ PDF decrypted and saved to {output_pdf}", file=sys.stderr)
+        return
 
-    with open(output_pdf, 'wb') as output:
-        writer.write(output)
+    with pymupdf.open("pdf", read_pdf_bytes(input_pdf)) as doc:
+        # Files with only an owner password open unlocked, so is_encrypted
+        # is False for them; metadata still reports the encryption
+        if not (doc.needs_pass or doc.metadata["encryption"]):
+            # Just copy it
+            print("Warning: PDF is not encrypted", file=sys.stderr)
+        else:
+            print("Decrypting PDF...", file=sys.stderr)
+
+            # Try to decrypt
+            if not doc.authenticate(password):
+                print("Error: Incorrect password", file=sys.stderr)
+                sys.exit(1)
+
+        doc.save(output_pdf, encryption=pymupdf.PDF_ENCRYPT_NONE)
 
     print(f"✓ PDF decrypted and saved to {output_pdf}", file=sys.stderr)
 
 
+def _protect_pdf(pdf_path, output_path, action, password):
+    """Batch worker: encrypt or decrypt one PDF."""
+    if action == 'encrypt':
+        encrypt_pdf(pdf_path, output_path, password)
+    else:
+        decrypt_pdf(pdf_path, output_path, password)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Encrypt or decrypt PDF files')
     parser.add_argument('action', choices=['encrypt', 'decrypt'],
                        help='Action to perform')
-    parser.add_argument('input', help='Input PDF file')
-    parser.add_argument('output', help='Output PDF file')
+    parser.add_argument('input', help='Input PDF file (glob pattern with --batch)')
+    parser.add_argument('output', help='Output PDF file (directory with --batch)')
     parser.add_argument('password', help='Password for encryption/decryption')
+    add_batch_arguments(parser)
 
     args = parser.parse_args()
 
     try:
-        if args.action == 'encrypt':
+        if args.batch:
+            pdf_files = expand_inputs(args.input)
+            _, failures = PdfBatchProcessor(args.workers).map(
+                _protect_pdf, pdf_files, args.action, args.password,
+                outputs=batch_outputs(pdf_files, args.output, '.pdf')
+            )
+            if failures:
+                sys.exit(1)
+        elif args.action == 'encrypt':
             encrypt_pdf(args.input, args.output, args.password)
         else:
             decrypt_pdf(args.input, args.output, args.password)
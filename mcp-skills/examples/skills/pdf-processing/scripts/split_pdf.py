@@ -6,17 +6,26 @@ Usage:
     python split_pdf.py input.pdf output_dir/
     python split_pdf.py input.pdf output_dir/ --pages 1-3,5,7-9
     python split_pdf.py input.pdf output_dir/ --prefix chapter_
+    python split_pdf.py "docs/*.pdf" output_dir/ --batch
 """
 
 import sys
 import argparse
+import itertools
 import os
-from pypdf import PdfReader, PdfWriter
+import tempfile
+import pymupdf
+from pdf_batch import (PdfBatchProcessor, add_batch_arguments, batch_outputs, expand_inputs,
+                       process_pool, worker_count)
+from pdf_io import QPDF, check_qpdf, mmap_pdf, run_qpdf
 
 
 def parse_page_ranges(range_str, total_pages):
     """Parse page ranges like '1-3,5,7-9' into list of page numbers."""
-    pages = []
+    # One flag per page; ranges are set with slice assignment, so large or
+    # overlapping ranges never build intermediate lists, and the result comes
+    # out sorted and de-duplicated
+    selected = bytearray(total_pages + 1)
 
     for part in range_str.split(','):
         if '-' in part:
@@ -24,20 +33,77 @@ def parse_page_ranges(range_str, total_pages):
             start, end = int(start), int(end)
             if start < 1 or end > total_pages:
                 raise ValueError(f"Page range {start}-{end} out of bounds (1-{total_pages})")
-            pages.extend(range(start, end + 1))
+            selected[start:end + 1] = b'\x01' * max(0, end - start + 1)
         else:
             page = int(part)
             if page < 1 or page > total_pages:
                 raise ValueError(f"Page {page} out of bounds (1-{total_pages})")
-            pages.append(page)
+            selected[page] = 1
 
-    return sorted(set(pages))
+    return list(itertools.compress(range(total_pages + 1), selected))
+
+
+def format_page_ranges(page_numbers):
+    """Format sorted page numbers as a range string like '1-3,5,7-9'."""
+    ranges = []
+
+    for page in page_numbers:
+        if ranges and ranges[-1][1] == page - 1:
+            ranges[-1][1] = page
+        else:
+            ranges.append([page, page])
+
+    return ",".join(f"{start}-{end}" if start != end else str(start)
+                    for start, end in ranges)
+
+
+_worker_source = None
+
+
+def _init_worker(input_pdf):
+    """Open the source PDF once per worker process."""
+    global _worker_source
+    # Each worker maps the file itself, so all of them share the kernel's
+    # copy instead of receiving the PDF bytes through a pipe
+    _worker_source = pymupdf.open("pdf", memoryview(mmap_pdf(input_pdf)))
+
+
+def _write_page(page_num, output_dir, prefix):
+    """Write a single page to its own PDF in a worker process."""
+    output_path = os.path.join(output_dir, f"{prefix}{page_num}.pdf")
+
+    with pymupdf.open() as page_doc:
+        page_doc.insert_pdf(_worker_source, from_page=page_num - 1, to_page=page_num - 1)
+        page_doc.save(output_path)
+
+    return output_path
+
+
+def _split_with_qpdf(input_pdf, output_dir, page_numbers, prefix):
+    """Split selected pages in a single qpdf pass."""
+    with tempfile.TemporaryDirectory(dir=output_dir) as tmpdir:
+        check_qpdf(run_qpdf([
+            input_pdf,
+            "--pages", ".", format_page_ranges(page_numbers), "--",
+            "--split-pages", os.path.join(tmpdir, "%d.pdf"),
+        ]))
+
+        # qpdf numbers outputs by position in the selection (zero-padded),
+        # so map them back to source page numbers
+        outputs = sorted(os.listdir(tmpdir), key=lambda name: int(os.path.splitext(name)[0]))
+        for name, page_num in zip(outputs, page_numbers):
+            output_path = os.path.join(output_dir, f"{prefix}{page_num}.pdf")
+            os.replace(os.path.join(tmpdir, name), output_path)
+            print(f"  Created {output_path}", file=sys.stderr)
 
 
 def split_pdf(input_pdf, output_dir, pages=None, prefix='page_'):
     """Split PDF into individual pages."""
-    reader = PdfReader(input_pdf)
-    total_pages = len(reader.pages)
+    # PyMuPDF takes a memoryview of the map without copying it; the view is
+    # released before the map is closed
+    with mmap_pdf(input_pdf) as source, memoryview(source) as view:
+        with pymupdf.open("pdf", view) as doc:
+            total_pages = doc.page_count
 
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
@@ -50,29 +116,45 @@ def split_pdf(input_pdf, output_dir, pages=None, prefix='page_'):
 
     print(f"Splitting {len(page_numbers)} pages from {input_pdf}...", file=sys.stderr)
 
-    for page_num in page_numbers:
-        writer = PdfWriter()
-        writer.add_page(reader.pages[page_num - 1])
+    if QPDF:
+        _split_with_qpdf(input_pdf, output_dir, page_numbers, prefix)
+        print(f"✓ Successfully split {len(page_numbers)} pages", file=sys.stderr)
+        return
 
-        output_path = os.path.join(output_dir, f"{prefix}{page_num}.pdf")
-        with open(output_path, 'wb') as output:
-            writer.write(output)
+    with process_pool(min(worker_count(8), len(page_numbers)),
+                      initializer=_init_worker, initargs=(input_pdf,)) as executor:
+        futures = [executor.submit(_write_page, page_num, output_dir, prefix)
+                   for page_num in page_numbers]
 
-        print(f"  Created {output_path}", file=sys.stderr)
+        for future in futures:
+            print(f"  Created {future.result()}", file=sys.stderr)
 
     print(f"✓ Successfully split {len(page_numbers)} pages", file=sys.stderr)
 
 
 def main():
     parser = argparse.ArgumentParser(description='Split PDF into individual pages')
-    parser.add_argument('input', help='Input PDF file')
-    parser.add_argument('output_dir', help='Output directory for split pages')
+    parser.add_argument('input', help='Input PDF file (glob pattern with --batch)')
+    parser.add_argument('output_dir',
+                       help='Output directory for split pages (one subdirectory per file with --batch)')
     parser.add_argument('--pages', help='Page ranges to extract (e.g., "1-3,5,7-9")')
     parser.add_argument('--prefix', default='page_', help='Prefix for output files')
+    add_batch_arguments(parser)
 
     args = parser.parse_args()
 
     try:
+        if args.batch:
+            # Each file's pages go to a subdirectory named after the file
+            pdf_files = expand_inputs(args.input)
+            _, failures = PdfBatchProcessor(args.workers).map(
+                split_pdf, pdf_files, args.pages, args.prefix,
+                outputs=batch_outputs(pdf_files, args.output_dir, '')
+            )
+            if failures:
+                sys.exit(1)
+            return
+
         split_pdf(args.input, args.output_dir, args.pages, args.prefix)
     except FileNotFoundError:
         print(f"Error: File '{args.input}' not found", file=sys.stderr)